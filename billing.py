@@ -1,8 +1,9 @@
 import csv
-import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from sales_ledger import SALES_HEADER, SalesLedger, has_sales_data, iter_sales_rows
+
 
 class BillItem:
     """Represents a single item in the bill"""
@@ -197,39 +198,52 @@ class Bill:
         self.payment_method = method
         self.payment_status = status
 
-    def save_to_csv(self, filename: str = "daily_sales.csv"):
-        """Save bill details to CSV file"""
+    def _ledger_rows(self) -> List[list]:
+        """One sales row per item, in SALES_HEADER order"""
+        total_amount = self.calculate_total()
+        return [
+            [
+                self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                self.bill_number,
+                self.customer_name,
+                item.product.pid,
+                item.product.name,
+                item.quantity,
+                item.unit_price,
+                item.subtotal,
+                self.discount_percent,
+                self.tax_percent,
+                total_amount,
+                self.payment_method,
+                self.payment_status
+            ]
+            for item in self.items
+        ]
+
+    def _record_in_index(self, customer_index, source: str, offset: int):
+        if customer_index is not None:
+            customer_index.record_bill(
+                self.customer_name,
+                self.bill_number,
+                self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                self.calculate_total(),
+                source,
+                offset
+            )
+
+    def save_to_csv(self, filename: str = "daily_sales.csv", customer_index=None):
+        """Save bill details to CSV file and record it in the customer index"""
         try:
             with open(filename, mode="a", newline="", encoding="utf-8") as file:
                 writer = csv.writer(file)
 
                 if file.tell() == 0:
-                    writer.writerow([
-                        "Date", "Bill_Number", "Customer",
-                        "Product_ID", "Product_Name", "Quantity",
-                        "Unit_Price", "Subtotal",
-                        "Discount_Percent", "Tax_Percent",
-                        "Total_Amount", "Payment_Method", "Payment_Status"
-                    ])
-
-                total_amount = self.calculate_total()
-
-                for item in self.items:
-                    writer.writerow([
-                        self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                        self.bill_number,
-                        self.customer_name,
-                        item.product.pid,
-                        item.product.name,
-                        item.quantity,
-                        item.unit_price,
-                        item.subtotal,
-                        self.discount_percent,
-                        self.tax_percent,
-                        total_amount,
-                        self.payment_method,
-                        self.payment_status
-                    ])
+                    writer.writerow(SALES_HEADER)
+
+                offset = file.tell()
+                writer.writerows(self._ledger_rows())
+
+            self._record_in_index(customer_index, filename, offset)
 
             print(f"💾 Bill saved to {filename}")
             return True
@@ -238,6 +252,22 @@ class Bill:
             print(f"❌ Error saving bill: {e}")
             return False
 
+    def save_to_ledger(self, ledger: Optional[SalesLedger] = None, customer_index=None):
+        """Append bill details to the segmented sales ledger"""
+        try:
+            if ledger is None:
+                ledger = SalesLedger()
+
+            path, offset = ledger.append_rows(self._ledger_rows())
+            self._record_in_index(customer_index, path, offset)
+
+            print(f"💾 Bill saved to {path}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving bill: {e}")
+            return False
+
 
 class PaymentProcessor:
     """Handles different payment methods"""
@@ -310,8 +340,9 @@ class ReportGenerator:
     """Generates various reports from sales data"""
 
     @staticmethod
-    def generate_payment_summary(filename: str = "daily_sales.csv") -> Dict:
-        if not os.path.exists(filename):
+    def generate_payment_summary(filename: str = "daily_sales.csv",
+                                 ledger_dir: str = "sales_ledger") -> Dict:
+        if not has_sales_data(filename, ledger_dir):
             return {"error": "No sales data found"}
 
         payment_summary = {
@@ -323,30 +354,28 @@ class ReportGenerator:
         }
 
         try:
-            with open(filename, mode="r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                processed_bills = set()
+            processed_bills = set()
 
-                for row in reader:
-                    bill_number = row.get("Bill_Number", "")
-                    if bill_number in processed_bills:
-                        continue
+            for row in iter_sales_rows(filename, ledger_dir):
+                bill_number = row.get("Bill_Number", "")
+                if bill_number in processed_bills:
+                    continue
 
-                    processed_bills.add(bill_number)
-                    payment_method = row.get("Payment_Method", "Cash")
-                    total_amount_str = row.get("Total_Amount", "0")
+                processed_bills.add(bill_number)
+                payment_method = row.get("Payment_Method", "Cash")
+                total_amount_str = row.get("Total_Amount", "0")
 
-                    try:
-                        total_amount = float(total_amount_str) if total_amount_str else 0.0
-                    except (ValueError, TypeError):
-                        total_amount = 0.0
+                try:
+                    total_amount = float(total_amount_str) if total_amount_str else 0.0
+                except (ValueError, TypeError):
+                    total_amount = 0.0
 
-                    if payment_method in payment_summary:
-                        payment_summary[payment_method]["count"] += 1
-                        payment_summary[payment_method]["amount"] += total_amount
+                if payment_method in payment_summary:
+                    payment_summary[payment_method]["count"] += 1
+                    payment_summary[payment_method]["amount"] += total_amount
 
-                    payment_summary["total_transactions"] += 1
-                    payment_summary["total_amount"] += total_amount
+                payment_summary["total_transactions"] += 1
+                payment_summary["total_amount"] += total_amount
 
             return payment_summary
 
@@ -354,8 +383,9 @@ class ReportGenerator:
             return {"error": f"Error reading sales data: {e}"}
 
     @staticmethod
-    def generate_daily_summary(date: str = None, filename: str = "daily_sales.csv") -> Dict:
-        if not os.path.exists(filename):
+    def generate_daily_summary(date: str = None, filename: str = "daily_sales.csv",
+                               ledger_dir: str = "sales_ledger") -> Dict:
+        if not has_sales_data(filename, ledger_dir):
             return {"error": "No sales data found"}
 
         if date is None:
@@ -373,57 +403,55 @@ class ReportGenerator:
         }
 
         try:
-            with open(filename, mode="r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                processed_bills = set()
-                customers = set()
-
-                for row in reader:
-                    row_date = row.get("Date", "").split(" ")[0]
-                    if row_date != date:
-                        continue
-
-                    bill_number = row.get("Bill_Number", "")
-                    customer = row.get("Customer", "")
-                    product_name = row.get("Product_Name", "")
-
-                    try:
-                        quantity = int(row.get("Quantity", "0")) if row.get("Quantity") else 0
-                        total_amount = float(row.get("Total_Amount", "0")) if row.get("Total_Amount") else 0.0
-                        discount_percent = float(row.get("Discount_Percent", "0")) if row.get("Discount_Percent") else 0.0
-                    except (ValueError, TypeError):
-                        quantity = 0
-                        total_amount = 0.0
-                        discount_percent = 0.0
-
-                    if bill_number not in processed_bills:
-                        processed_bills.add(bill_number)
-                        daily_summary["total_bills"] += 1
-                        daily_summary["total_revenue"] += total_amount
-                        daily_summary["total_discount"] += (
-                            (total_amount * discount_percent) / (100 - discount_percent)
-                            if discount_percent > 0 else 0
-                        )
-
-                    if customer:
-                        customers.add(customer)
-
-                    daily_summary["total_items_sold"] += quantity
-
-                    if product_name in daily_summary["top_products"]:
-                        daily_summary["top_products"][product_name] += quantity
-                    else:
-                        daily_summary["top_products"][product_name] = quantity
-
-                daily_summary["customer_count"] = len(customers)
-
-                daily_summary["top_products"] = dict(
-                    sorted(
-                        daily_summary["top_products"].items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:5]
-                )
+            processed_bills = set()
+            customers = set()
+
+            for row in iter_sales_rows(filename, ledger_dir, date, date):
+                row_date = row.get("Date", "").split(" ")[0]
+                if row_date != date:
+                    continue
+
+                bill_number = row.get("Bill_Number", "")
+                customer = row.get("Customer", "")
+                product_name = row.get("Product_Name", "")
+
+                try:
+                    quantity = int(row.get("Quantity", "0")) if row.get("Quantity") else 0
+                    total_amount = float(row.get("Total_Amount", "0")) if row.get("Total_Amount") else 0.0
+                    discount_percent = float(row.get("Discount_Percent", "0")) if row.get("Discount_Percent") else 0.0
+                except (ValueError, TypeError):
+                    quantity = 0
+                    total_amount = 0.0
+                    discount_percent = 0.0
+
+                if bill_number not in processed_bills:
+                    processed_bills.add(bill_number)
+                    daily_summary["total_bills"] += 1
+                    daily_summary["total_revenue"] += total_amount
+                    daily_summary["total_discount"] += (
+                        (total_amount * discount_percent) / (100 - discount_percent)
+                        if discount_percent > 0 else 0
+                    )
+
+                if customer:
+                    customers.add(customer)
+
+                daily_summary["total_items_sold"] += quantity
+
+                if product_name in daily_summary["top_products"]:
+                    daily_summary["top_products"][product_name] += quantity
+                else:
+                    daily_summary["top_products"][product_name] = quantity
+
+            daily_summary["customer_count"] = len(customers)
+
+            daily_summary["top_products"] = dict(
+                sorted(
+                    daily_summary["top_products"].items(),
+                    key=lambda x: x[1],
+                    reverse=True
+                )[:5]
+            )
 
             return daily_summary
 
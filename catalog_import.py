@@ -0,0 +1,133 @@
+import csv
+import os
+from typing import Dict
+
+from product import Product
+from product_file_io import save_inventory_to_file
+from stock_reconciliation import record_stock_adjustments
+
+
+def apply_catalog_feed(inventory, feed_filename: str, delete_missing: bool = False,
+                       save_to: str = "products.csv",
+                       journal_file: str = "stock_journal.csv") -> Dict:
+    """
+    Apply a supplier feed to the inventory in one batch.
+
+    The feed is a CSV with pid,name,price,stock and an optional action
+    column ("delete" removes the product). Rows are streamed, validated
+    with the Product rules and diffed against the current inventory;
+    nothing is changed until the whole feed has been read, and the
+    result is persisted with a single save.
+    With delete_missing=True, products absent from the feed are removed.
+    Stock changes are journaled so reconciliation treats them as restocks.
+    """
+    report = {
+        "added": 0,
+        "updated": 0,
+        "deleted": 0,
+        "unchanged": 0,
+        "rejected": []      # (line number, reason)
+    }
+
+    if not os.path.exists(feed_filename):
+        report["error"] = "Feed file not found"
+        return report
+
+    adds = {}
+    updates = {}
+    deletes = set()
+    seen = set()
+
+    try:
+        with open(feed_filename, "r", newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            missing = {"pid", "name", "price", "stock"} - set(reader.fieldnames or [])
+            if missing:
+                report["error"] = f"Feed is missing columns: {', '.join(sorted(missing))}"
+                return report
+
+            for line, row in enumerate(reader, start=2):
+                try:
+                    pid = int(row["pid"])
+                    if pid in seen:
+                        raise ValueError("Duplicate product ID in feed")
+                    seen.add(pid)
+
+                    if (row.get("action") or "").strip().lower() == "delete":
+                        if pid in inventory.products:
+                            deletes.add(pid)
+                        else:
+                            raise ValueError("Product not found for delete")
+                        continue
+
+                    name = (row["name"] or "").strip()
+                    if not name:
+                        raise ValueError("Name is required")
+                    product = Product(pid, name, float(row["price"]), int(row["stock"]))
+
+                except (ValueError, TypeError) as e:
+                    report["rejected"].append((line, str(e)))
+                    continue
+
+                current = inventory.get_product(pid)
+                if current is None:
+                    adds[pid] = product
+                elif (current.name, current.price, current.stock) != \
+                        (product.name, product.price, product.stock):
+                    updates[pid] = product
+                else:
+                    report["unchanged"] += 1
+
+    except Exception as e:
+        report["error"] = f"Error reading feed: {e}"
+        return report
+
+    if delete_missing:
+        deletes.update(pid for pid in inventory.products if pid not in seen)
+
+    for pid, product in adds.items():
+        inventory.add_product(product)
+
+    stock_changes = []
+    for pid, product in updates.items():
+        current = inventory.get_product(pid)
+        stock_changes.append((current, current.stock))
+        current.name = product.name
+        current.price = product.price
+        current.stock = product.stock
+
+    for pid in deletes:
+        inventory.remove_product(pid)
+
+    report["added"] = len(adds)
+    report["updated"] = len(updates)
+    report["deleted"] = len(deletes)
+
+    if (adds or updates or deletes) and not save_inventory_to_file(inventory, save_to):
+        report["error"] = f"Changes applied in memory but could not be saved to {save_to}"
+
+    record_stock_adjustments(stock_changes, "Catalog import", journal_file)
+
+    return report
+
+
+def display_import_report(report: Dict):
+    if "error" in report:
+        print(f"❌ {report['error']}")
+        return
+
+    print("\n" + "=" * 40)
+    print("         CATALOG IMPORT SUMMARY")
+    print("=" * 40)
+    print(f"Added: {report['added']}")
+    print(f"Updated: {report['updated']}")
+    print(f"Deleted: {report['deleted']}")
+    print(f"Unchanged: {report['unchanged']}")
+    print(f"Rejected: {len(report['rejected'])}")
+
+    for line, reason in report["rejected"][:10]:
+        print(f"  Line {line}: {reason}")
+    if len(report["rejected"]) > 10:
+        print(f"  ... and {len(report['rejected']) - 10} more")
+
+    print("=" * 40)
@@ -0,0 +1,239 @@
+import csv
+import heapq
+import io
+import os
+from typing import Dict, List, Optional
+
+from sales_ledger import iter_sales_records, open_sales_file
+
+WALK_IN_CUSTOMER = "Walk-in Customer"
+
+
+class CustomerIndex:
+    """
+    Per-customer purchase history kept alongside the sales ledger.
+
+    customer_index.csv holds one row per bill (not per item) with the
+    ledger file and byte offset of the bill, so customer queries never
+    scan the sales ledger. Aggregates are rebuilt in memory from the index file
+    on load and kept up to date as bills are recorded.
+    """
+
+    HEADER = ["Customer", "Bill_Number", "Date", "Total_Amount", "Source", "Offset"]
+
+    def __init__(self, filename: str = "customer_index.csv"):
+        self.filename = filename
+        self.customers: Dict[str, Dict] = {}
+        self.load()
+
+    def _add_entry(self, entry: Dict):
+        stats = self.customers.get(entry["customer"])
+        if stats is None:
+            stats = {"bills": [], "lifetime_spend": 0.0, "months": set()}
+            self.customers[entry["customer"]] = stats
+
+        stats["bills"].append(entry)
+        stats["lifetime_spend"] += entry["total"]
+        stats["months"].add(entry["date"][:7])
+
+    @staticmethod
+    def _entry_from_row(row: List[str]) -> Dict:
+        customer, bill_number, date, total, source, offset = row
+        return {
+            "customer": customer,
+            "bill_number": bill_number,
+            "date": date,
+            "total": float(total),
+            "source": source,
+            "offset": int(offset),
+        }
+
+    def load(self):
+        """Load aggregates from the index file"""
+        self.customers = {}
+        if not os.path.exists(self.filename):
+            return
+
+        try:
+            with open(self.filename, "r", newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                for row in reader:
+                    try:
+                        self._add_entry(self._entry_from_row(row))
+                    except (ValueError, TypeError):
+                        continue
+        except Exception as e:
+            print("❌ Error loading customer index:", e)
+
+    def _append_rows(self, entries: List[Dict]):
+        with open(self.filename, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if file.tell() == 0:
+                writer.writerow(self.HEADER)
+            self._write_entries(writer, entries)
+
+    @staticmethod
+    def _write_entries(writer, entries: List[Dict]):
+        writer.writerows(
+            [entry["customer"], entry["bill_number"], entry["date"],
+             entry["total"], entry["source"], entry["offset"]]
+            for entry in entries
+        )
+
+    def record_bill(self, customer: str, bill_number: str, date: str,
+                    total: float, source: str, offset: int):
+        """Add one saved bill to the index"""
+        entry = {
+            "customer": customer,
+            "bill_number": bill_number,
+            "date": date,
+            "total": total,
+            "source": source,
+            "offset": offset,
+        }
+        try:
+            self._append_rows([entry])
+            self._add_entry(entry)
+        except Exception as e:
+            print("❌ Error updating customer index:", e)
+
+    def is_stale(self, filename: str = "daily_sales.csv", ledger_dir: str = "sales_ledger") -> bool:
+        """True if sales were written after the index (or there is no index yet)"""
+        sources = [path for path in (filename, os.path.join(ledger_dir, "manifest.csv"))
+                   if os.path.exists(path)]
+        if not sources:
+            return False
+        if not os.path.exists(self.filename):
+            return True
+        index_time = os.path.getmtime(self.filename)
+        return any(os.path.getmtime(path) > index_time for path in sources)
+
+    def rebuild(self, filename: str = "daily_sales.csv", ledger_dir: str = "sales_ledger"):
+        """
+        One-off full scan of the legacy file and all ledger segments to
+        (re)create the index
+        """
+        entries = []
+        seen = set()
+
+        for source, offset, row in iter_sales_records(filename, ledger_dir):
+            bill_number = row.get("Bill_Number")
+            if not bill_number or bill_number in seen:
+                continue
+            seen.add(bill_number)
+
+            try:
+                total = float(row.get("Total_Amount") or 0)
+            except ValueError:
+                total = 0.0
+
+            entries.append({
+                "customer": row.get("Customer", ""),
+                "bill_number": bill_number,
+                "date": row.get("Date", ""),
+                "total": total,
+                "source": source,
+                "offset": offset,
+            })
+
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.HEADER)
+            self._write_entries(writer, entries)
+        os.replace(temp_filename, self.filename)
+
+        self.customers = {}
+        for entry in entries:
+            self._add_entry(entry)
+
+        return len(entries)
+
+    def last_bills(self, customer: str, n: int = 5) -> List[Dict]:
+        """Most recent n bills of a customer, newest first"""
+        stats = self.customers.get(customer)
+        if not stats:
+            return []
+        return list(reversed(stats["bills"][-n:]))
+
+    def lifetime_spend(self, customer: str) -> float:
+        stats = self.customers.get(customer)
+        return stats["lifetime_spend"] if stats else 0.0
+
+    def top_spenders(self, n: int = 5) -> List[tuple]:
+        """(customer, lifetime spend) for the n biggest spenders"""
+        return heapq.nlargest(
+            n,
+            ((name, stats["lifetime_spend"])
+             for name, stats in self.customers.items()
+             if name != WALK_IN_CUSTOMER),
+            key=lambda x: x[1]
+        )
+
+    def repeat_customer_rate(self, start_month: str = None, end_month: str = None) -> float:
+        """
+        Share of named customers who bought in more than one month
+        within the optional YYYY-MM range
+        """
+        total = 0
+        repeat = 0
+
+        for name, stats in self.customers.items():
+            if name == WALK_IN_CUSTOMER:
+                continue
+            months = [m for m in stats["months"]
+                      if (start_month is None or m >= start_month)
+                      and (end_month is None or m <= end_month)]
+            if not months:
+                continue
+            total += 1
+            if len(months) > 1:
+                repeat += 1
+
+        return (repeat / total) if total else 0.0
+
+    @staticmethod
+    def read_bill_rows(entry: Dict) -> List[Dict]:
+        """Fetch the ledger rows of an indexed bill by seeking to its offset"""
+        rows = []
+        with open_sales_file(entry["source"]) as file:
+            header = next(csv.reader([file.readline().decode("utf-8")]), [])
+            file.seek(entry["offset"])
+            reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8", newline=""),
+                                    fieldnames=header)
+            for row in reader:
+                if row.get("Bill_Number") != entry["bill_number"]:
+                    break
+                rows.append(row)
+        return rows
+
+    def display_customer_report(self, customer: Optional[str] = None, n: int = 5):
+        print("\n" + "=" * 50)
+        print("            CUSTOMER REPORT")
+        print("=" * 50)
+
+        if customer:
+            bills = self.last_bills(customer, n)
+            if not bills:
+                print(f"⚠ No bills found for {customer}")
+            else:
+                print(f"Customer: {customer}")
+                print(f"Lifetime Spend: ₹{self.lifetime_spend(customer):.2f}")
+                print(f"Total Bills: {len(self.customers[customer]['bills'])}")
+                print("-" * 50)
+                print(f"LAST {len(bills)} BILLS:")
+                for bill in bills:
+                    print(f"  {bill['date']}  {bill['bill_number']}  ₹{bill['total']:.2f}")
+            print("-" * 50)
+
+        print("TOP SPENDERS:")
+        spenders = self.top_spenders(n)
+        if spenders:
+            for name, amount in spenders:
+                print(f"  {name}: ₹{amount:.2f}")
+        else:
+            print("  No customer data available")
+
+        print(f"Repeat Customer Rate: {self.repeat_customer_rate() * 100:.1f}%")
+        print("=" * 50)
@@ -1,7 +1,17 @@
+from datetime import datetime
+
 from product import Product, load_inventory
 from order import Order
 from billing import Bill, PaymentProcessor, ReportGenerator
 from product_file_io import load_inventory_from_file, save_inventory_to_file
+from customer_index import CustomerIndex
+from sales_ledger import SalesLedger
+from stock_history import StockHistory
+from stock_reconciliation import (
+    take_stock_snapshot, reconcile_stock, write_correction_journal, display_reconciliation,
+    record_stock_adjustments
+)
+from catalog_import import apply_catalog_feed, display_import_report
 
 
 def product_menu(inventory):
@@ -11,7 +21,8 @@ def product_menu(inventory):
         print("2. Add Product")
         print("3. Update Stock")
         print("4. Delete Product")
-        print("5. Back")
+        print("5. Bulk Import Catalog")
+        print("6. Back")
 
         try:
             choice = input("Choice: ")
@@ -33,20 +44,27 @@ def product_menu(inventory):
                 stock = int(input("New Stock: "))
                 product = inventory.get_product(pid)
                 if product:
+                    old_stock = product.stock
                     product.stock = stock
                     save_inventory_to_file(inventory)
+                    record_stock_adjustments([(product, old_stock)], "Manual update")
                 else:
                     print("❌ Product not found")
 
             elif choice == "4":
                 pid = int(input("ID: "))
-                if pid in inventory.products:
-                    del inventory.products[pid]
+                if inventory.remove_product(pid):
                     save_inventory_to_file(inventory)
                 else:
                     print("❌ Product not found")
 
             elif choice == "5":
+                feed = input("Feed file: ").strip()
+                delete_missing = input("Delete products missing from feed? (y/n): ").strip().lower() == "y"
+                report = apply_catalog_feed(inventory, feed, delete_missing)
+                display_import_report(report)
+
+            elif choice == "6":
                 break
 
             else:
@@ -58,7 +76,7 @@ def product_menu(inventory):
             print("❌ Error:", e)
 
 
-def order_and_billing_menu(inventory):
+def order_and_billing_menu(inventory, customer_index, ledger):
     order = Order()
 
     name = input("Enter customer name (press Enter for Walk-in): ").strip()
@@ -96,12 +114,69 @@ def order_and_billing_menu(inventory):
     bill.display_bill()
 
     if bill.process_payment():
-        bill.save_to_csv()          # saves data to daily_sales.csv
+        bill.save_to_ledger(ledger, customer_index)   # saves data to sales_ledger/
         save_inventory_to_file(inventory)
     else:
         print("❌ Payment failed. Order not saved.")
 
+def stock_reconciliation_menu(inventory):
+    report = reconcile_stock(inventory)
+
+    if report.get("error") == "No stock snapshot found":
+        as_of = take_stock_snapshot(inventory)
+        print(f"📸 No snapshot found. Stock snapshot taken at {as_of}")
+        return
+
+    display_reconciliation(report)
+
+    if report.get("discrepancies"):
+        fix = input("Write correcting journal entries and fix stock? (y/n): ").strip().lower()
+        if fix == "y":
+            if write_correction_journal(report["discrepancies"], inventory):
+                print("💾 Corrections saved to stock_journal.csv")
+            else:
+                print("❌ Corrections journaled but products.csv could not be saved")
+
+    if input("Take a new stock snapshot? (y/n): ").strip().lower() == "y":
+        print(f"📸 Stock snapshot taken at {take_stock_snapshot(inventory)}")
+
+
+def stock_history_menu(inventory):
+    history = inventory.history
+    pid = input("Product ID (press Enter for all products): ").strip()
+
+    try:
+        if pid:
+            pid = int(pid)
+            when = datetime.strptime(
+                input("Date & time (YYYY-MM-DD HH:MM:SS): ").strip(), "%Y-%m-%d %H:%M:%S"
+            ).strftime("%Y-%m-%d %H:%M:%S")
+            stock = history.stock_at(pid, when)
+            if stock is None:
+                print("⚠ No stock recorded for this product at that time")
+            else:
+                print(f"Stock of {pid} at {when}: {stock}")
+        else:
+            date = datetime.strptime(
+                input("Date (YYYY-MM-DD): ").strip(), "%Y-%m-%d"
+            ).strftime("%Y-%m-%d")
+            snapshot = history.close_of_day(date)
+            if not snapshot:
+                print("⚠ No stock recorded at that date")
+                return
+
+            print(f"\n--- STOCK AT CLOSE OF {date} ---")
+            print("{:<8} {:<10}".format("ID", "Stock"))
+            print("-" * 20)
+            for product_id, stock in sorted(snapshot.items()):
+                print("{:<8} {:<10}".format(product_id, stock))
+
+    except ValueError:
+        print("❌ Invalid input")
+
+
 def main():
+    history = None
     try:
         inventory = load_inventory_from_file()
 
@@ -110,6 +185,19 @@ def main():
             inventory = load_inventory()
             save_inventory_to_file(inventory)
 
+        history = StockHistory()
+        inventory.attach_history(history)
+        customer_index = CustomerIndex()
+        ledger = SalesLedger()
+
+        migrated, skipped = ledger.migrate_legacy()
+        if migrated or skipped:
+            print(f"📦 Moved {migrated} sales rows from daily_sales.csv into sales_ledger/"
+                  f" ({skipped} unreadable rows left in daily_sales.csv.migrated)")
+
+        if customer_index.is_stale():
+            print(f"🔄 Indexed {customer_index.rebuild()} bills for customer reports")
+
         while True:
             print("\n===== SMART RETAIL SYSTEM =====")
             print("1. Product Management")
@@ -117,7 +205,10 @@ def main():
             print("3. Low Stock Products")
             print("4. Daily Sales Summary")
             print("5. Payment Summary")
-            print("6. Exit")
+            print("6. Customer Report")
+            print("7. Stock Reconciliation")
+            print("8. Stock History")
+            print("9. Exit")
 
 
             choice = input("Choice: ")
@@ -125,7 +216,7 @@ def main():
             if choice == "1":
                 product_menu(inventory)
             elif choice == "2":
-                order_and_billing_menu(inventory)
+                order_and_billing_menu(inventory, customer_index, ledger)
             elif choice == "3":
                 for p in inventory.low_stock_generator():
                     print()
@@ -138,6 +229,16 @@ def main():
                 ReportGenerator.display_payment_summary()
 
             elif choice == "6":
+                name = input("Customer name (press Enter for top spenders only): ").strip()
+                customer_index.display_customer_report(name if name else None)
+
+            elif choice == "7":
+                stock_reconciliation_menu(inventory)
+
+            elif choice == "8":
+                stock_history_menu(inventory)
+
+            elif choice == "9":
                 print("👋 Thank you, visit again!")
                 break
 
@@ -145,6 +246,9 @@ def main():
         print("\n👋 Program terminated by user")
     except Exception as e:
         print("❌ Unexpected error:", e)
+    finally:
+        if history is not None:
+            history.close()
 
 
 if __name__ == "__main__":
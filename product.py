@@ -10,8 +10,20 @@ class Product:
         self.pid = pid
         self.name = name
         self.price = price
+        self._on_stock_change = None   # set by Inventory when history is kept
         self.stock = stock
 
+    @property
+    def stock(self):
+        return self._stock
+
+    @stock.setter
+    def stock(self, value):
+        changed = getattr(self, "_stock", None) != value
+        self._stock = value
+        if changed and self._on_stock_change:
+            self._on_stock_change(self)
+
     def is_stock_available(self, quantity):
         if quantity <= 0:
             raise ValueError("Quantity must be greater than zero")
@@ -30,11 +42,51 @@ class Inventory:
 
     def __init__(self):
         self.products = {}
+        self.history = None
+
+    def attach_history(self, history):
+        """
+        Start recording every stock change into a StockHistory.
+        Stock that differs from the last recorded value (e.g. files
+        edited while the app was closed) is recorded first.
+        """
+        self.history = history
+        for product in self.products.values():
+            product._on_stock_change = self._stock_changed
+            if history.latest_stock(product.pid) != product.stock:
+                history.record(product.pid, product.stock)
+
+        # Products removed from the file while the app was closed
+        for pid in list(history.versions):
+            if pid not in self.products and history.latest_stock(pid) is not None:
+                history.record(pid, None)
+        self._checkpoint_if_due()
+
+    def _stock_changed(self, product):
+        self.history.record(product.pid, product.stock)
+        self._checkpoint_if_due()
+
+    def _checkpoint_if_due(self):
+        if self.history.checkpoint_due(len(self.products)):
+            self.history.checkpoint(self.products)
 
     def add_product(self, product):
         if product.pid in self.products:
             raise KeyError("Product ID already exists")
         self.products[product.pid] = product
+        if self.history:
+            product._on_stock_change = self._stock_changed
+            self._stock_changed(product)
+
+    def remove_product(self, pid):
+        product = self.products.pop(pid, None)
+        if product is None:
+            return False
+        product._on_stock_change = None
+        if self.history:
+            self.history.record(pid, None)
+            self._checkpoint_if_due()
+        return True
 
     def get_product(self, pid):
         return self.products.get(pid)
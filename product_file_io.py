@@ -27,11 +27,20 @@ def load_inventory_from_file(filename="products.csv"):
 
 
 def save_inventory_to_file(inventory, filename="products.csv"):
+    # Write to a temp file and swap it in, so a crash mid-write
+    # never leaves a half-written products.csv
+    temp_filename = filename + ".tmp"
     try:
-        with open(filename, "w", newline="", encoding="utf-8") as file:
+        with open(temp_filename, "w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
             writer.writerow(["pid", "name", "price", "stock"])
-            for p in inventory.products.values():
-                writer.writerow([p.pid, p.name, p.price, p.stock])
+            writer.writerows(
+                [p.pid, p.name, p.price, p.stock] for p in inventory.products.values()
+            )
+        os.replace(temp_filename, filename)
+        return True
     except Exception as e:
         print("❌ Error saving products:", e)
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        return False
@@ -0,0 +1,291 @@
+import csv
+import gzip
+import io
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional
+
+SALES_HEADER = [
+    "Date", "Bill_Number", "Customer",
+    "Product_ID", "Product_Name", "Quantity",
+    "Unit_Price", "Subtotal",
+    "Discount_Percent", "Tax_Percent",
+    "Total_Amount", "Payment_Method", "Payment_Status"
+]
+
+
+def open_sales_file(path: str):
+    """
+    Open a sales file in binary mode, following a segment to its
+    compressed .gz form once it has been sealed
+    """
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        path += ".gz"
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+class SalesLedger:
+    """
+    Sales ledger stored as a series of segments instead of one ever-growing file.
+
+    Rows are appended to an active CSV segment. A segment is sealed (gzip
+    compressed) when a new day starts or it reaches max_segment_bytes.
+    manifest.csv keeps the date range of every segment so readers can skip
+    segments outside the dates they need.
+    """
+
+    MANIFEST_HEADER = ["Segment", "First_Date", "Last_Date", "Rows", "Sealed"]
+
+    def __init__(self, directory: str = "sales_ledger",
+                 max_segment_bytes: int = 4 * 1024 * 1024, roll_daily: bool = True):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.roll_daily = roll_daily
+        self.manifest_file = os.path.join(directory, "manifest.csv")
+        self.segments: List[Dict] = []
+        self._load_manifest()
+
+    def _load_manifest(self):
+        self.segments = []
+        if not os.path.exists(self.manifest_file):
+            return
+
+        with open(self.manifest_file, "r", newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                self.segments.append({
+                    "segment": row["Segment"],
+                    "first_date": row["First_Date"],
+                    "last_date": row["Last_Date"],
+                    "rows": int(row["Rows"]),
+                    "sealed": row["Sealed"] == "1",
+                })
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_filename = self.manifest_file + ".tmp"
+        with open(temp_filename, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.MANIFEST_HEADER)
+            for seg in self.segments:
+                writer.writerow([
+                    seg["segment"], seg["first_date"], seg["last_date"],
+                    seg["rows"], "1" if seg["sealed"] else "0"
+                ])
+        os.replace(temp_filename, self.manifest_file)
+
+    def segment_path(self, seg: Dict) -> str:
+        """Path of the segment's CSV (sealed segments add .gz)"""
+        return os.path.join(self.directory, seg["segment"] + ".csv")
+
+    def _active_segment(self) -> Optional[Dict]:
+        if self.segments and not self.segments[-1]["sealed"]:
+            return self.segments[-1]
+        return None
+
+    def _needs_roll(self, seg: Dict, date: str) -> bool:
+        if self.roll_daily and seg["first_date"][:10] != date[:10]:
+            return True
+        path = self.segment_path(seg)
+        return os.path.exists(path) and os.path.getsize(path) >= self.max_segment_bytes
+
+    def _new_segment(self, date: str) -> Dict:
+        day = date[:10].replace("-", "")
+        seq = sum(1 for seg in self.segments if seg["segment"].startswith(f"sales-{day}-"))
+        seg = {
+            "segment": f"sales-{day}-{seq + 1:04d}",
+            "first_date": date,
+            "last_date": date,
+            "rows": 0,
+            "sealed": False,
+        }
+        self.segments.append(seg)
+        return seg
+
+    def seal(self, seg: Dict):
+        """Compress a finished segment and mark it sealed"""
+        path = self.segment_path(seg)
+        if os.path.exists(path):
+            temp_filename = path + ".gz.tmp"
+            with open(path, "rb") as src, gzip.open(temp_filename, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(temp_filename, path + ".gz")
+        seg["sealed"] = True
+        self._save_manifest()
+        # Only drop the plain file once the manifest points at the .gz
+        if os.path.exists(path):
+            os.remove(path)
+
+    def append_rows(self, rows: List[list]) -> tuple:
+        """
+        Append rows (in SALES_HEADER order) to the active segment,
+        rolling to a new one if needed. Returns (path, byte offset)
+        of the first written row.
+        """
+        if not rows:
+            raise ValueError("No rows to append")
+
+        os.makedirs(self.directory, exist_ok=True)
+        date = rows[0][0]
+
+        seg = self._active_segment()
+        if seg is not None and self._needs_roll(seg, date):
+            self.seal(seg)
+            seg = None
+        if seg is None:
+            seg = self._new_segment(date)
+
+        path = self.segment_path(seg)
+        with open(path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if file.tell() == 0:
+                writer.writerow(SALES_HEADER)
+            offset = file.tell()
+            writer.writerows(rows)
+
+        seg["last_date"] = max(seg["last_date"], rows[-1][0])
+        seg["rows"] += len(rows)
+        self._save_manifest()
+
+        return path, offset
+
+    def migrate_legacy(self, filename: str = "daily_sales.csv") -> tuple:
+        """
+        One-off move of a legacy single-file ledger into dated, sealed
+        segments placed before any existing ones. The legacy file is kept
+        as <filename>.migrated. Rows that do not match SALES_HEADER are
+        left out. Returns (rows migrated, rows skipped).
+        """
+        if not os.path.exists(filename):
+            return 0, 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        migrated_segments = []
+        seg = None
+        file = None
+        writer = None
+        migrated = 0
+        skipped = 0
+
+        def close_segment():
+            if file:
+                file.close()
+                self.seal(seg)
+
+        try:
+            with open(filename, "r", newline="", encoding="utf-8") as legacy:
+                reader = csv.reader(legacy)
+                next(reader, None)
+
+                for row in reader:
+                    date = row[0] if row else ""
+                    if len(row) != len(SALES_HEADER) or len(date) < 10 or date[4] != "-":
+                        skipped += 1
+                        continue
+
+                    if seg is None or seg["first_date"][:10] != date[:10] or \
+                            file.tell() >= self.max_segment_bytes:
+                        close_segment()
+                        seg = self._new_segment(date)
+                        # Keep the older, migrated history ahead of live segments
+                        self.segments.remove(seg)
+                        self.segments.insert(len(migrated_segments), seg)
+                        migrated_segments.append(seg)
+                        file = open(self.segment_path(seg), "w", newline="", encoding="utf-8")
+                        writer = csv.writer(file)
+                        writer.writerow(SALES_HEADER)
+
+                    writer.writerow(row)
+                    seg["first_date"] = min(seg["first_date"], date)
+                    seg["last_date"] = max(seg["last_date"], date)
+                    seg["rows"] += 1
+                    migrated += 1
+
+            close_segment()
+            file = None
+
+        finally:
+            if file:
+                file.close()
+
+        self._save_manifest()
+        os.replace(filename, filename + ".migrated")
+        return migrated, skipped
+
+    def iter_rows(self, start_date: str = None, end_date: str = None) -> Iterator[Dict]:
+        """
+        Stream rows across segments as dicts. start_date/end_date are
+        inclusive YYYY-MM-DD bounds; segments entirely outside them are
+        not opened.
+        """
+        for seg in self.segments:
+            if start_date and seg["last_date"][:10] < start_date:
+                continue
+            if end_date and seg["first_date"][:10] > end_date:
+                continue
+
+            path = self.segment_path(seg)
+            if seg["sealed"]:
+                path += ".gz"
+
+            with open_sales_file(path) as raw:
+                file = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                for row in csv.DictReader(file):
+                    row_date = (row.get("Date") or "")[:10]
+                    if start_date and row_date < start_date:
+                        continue
+                    if end_date and row_date > end_date:
+                        continue
+                    yield row
+
+
+def iter_sales_rows(filename: str = "daily_sales.csv", ledger_dir: str = "sales_ledger",
+                    start_date: str = None, end_date: str = None) -> Iterator[Dict]:
+    """
+    Stream sales rows from the legacy single-file ledger (if present)
+    followed by the segmented ledger
+    """
+    if os.path.exists(filename):
+        with open(filename, "r", newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                row_date = (row.get("Date") or "")[:10]
+                if start_date and row_date < start_date:
+                    continue
+                if end_date and row_date > end_date:
+                    continue
+                yield row
+
+    if os.path.isdir(ledger_dir):
+        yield from SalesLedger(ledger_dir).iter_rows(start_date, end_date)
+
+
+def iter_sales_records(filename: str = "daily_sales.csv",
+                       ledger_dir: str = "sales_ledger") -> Iterator[tuple]:
+    """
+    Like iter_sales_rows, but yields (path, byte offset, row) so callers
+    can seek back to a row later. Offsets inside sealed segments are
+    positions in the uncompressed data.
+    """
+    paths = []
+    if os.path.exists(filename):
+        paths.append(filename)
+    if os.path.isdir(ledger_dir):
+        ledger = SalesLedger(ledger_dir)
+        paths.extend(ledger.segment_path(seg) for seg in ledger.segments)
+
+    for path in paths:
+        with open_sales_file(path) as file:
+            header = next(csv.reader([file.readline().decode("utf-8")]), [])
+            while True:
+                offset = file.tell()
+                line = file.readline()
+                if not line:
+                    break
+                row = next(csv.reader([line.decode("utf-8")]), [])
+                if len(row) == len(header):
+                    yield path, offset, dict(zip(header, row))
+
+
+def has_sales_data(filename: str = "daily_sales.csv", ledger_dir: str = "sales_ledger") -> bool:
+    return os.path.exists(filename) or os.path.exists(os.path.join(ledger_dir, "manifest.csv"))
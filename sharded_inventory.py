@@ -0,0 +1,367 @@
+import bisect
+import hashlib
+import threading
+from contextlib import contextmanager
+from multiprocessing import Pipe, Process
+
+from product import Product
+
+
+def _hash_key(key) -> int:
+    """Stable hash (same value in every process, unlike built-in hash)"""
+    digest = hashlib.md5(str(key).encode("utf-8")).hexdigest()
+    return int(digest[:16], 16)
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to shard names.
+    Each shard owns several virtual nodes so keys spread evenly and adding
+    a shard only moves the keys that now land on its nodes.
+    """
+
+    def __init__(self, replicas: int = 64):
+        self.replicas = replicas
+        self._points = []      # sorted hash points
+        self._owners = {}      # hash point -> shard name
+
+    def add_node(self, name: str):
+        for i in range(self.replicas):
+            point = _hash_key(f"{name}#{i}")
+            bisect.insort(self._points, point)
+            self._owners[point] = name
+
+    def copy(self):
+        ring = HashRing(self.replicas)
+        ring._points = list(self._points)
+        ring._owners = dict(self._owners)
+        return ring
+
+    def remove_node(self, name: str):
+        for i in range(self.replicas):
+            point = _hash_key(f"{name}#{i}")
+            if self._owners.get(point) == name:
+                del self._owners[point]
+                self._points.pop(bisect.bisect_left(self._points, point))
+
+    def get_node(self, key) -> str:
+        if not self._points:
+            raise KeyError("Hash ring has no shards")
+        index = bisect.bisect(self._points, _hash_key(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+def _shard_worker(conn):
+    """
+    Worker process loop. Owns a plain dict of products for its keys and
+    answers (operation, args) requests sent over the pipe.
+    """
+    products = {}      # key -> Product
+    reserved = {}      # key -> quantity held by open reservations
+
+    while True:
+        try:
+            op, args = conn.recv()
+        except EOFError:
+            break
+
+        try:
+            if op == "stop":
+                conn.send((True, None))
+                break
+
+            elif op == "add":
+                key, pid, name, price, stock = args
+                if key in products:
+                    raise KeyError("Product ID already exists")
+                products[key] = Product(pid, name, price, stock)
+                result = True
+
+            elif op == "get":
+                product = products.get(args[0])
+                result = None
+                if product:
+                    result = (product.pid, product.name, product.price, product.stock)
+
+            elif op == "set_stock":
+                key, stock = args
+                if stock < 0:
+                    raise ValueError("Stock must be non-negative")
+                product = products.get(key)
+                if product:
+                    product.stock = stock
+                result = product is not None
+
+            elif op == "remove":
+                reserved.pop(args[0], None)
+                result = products.pop(args[0], None) is not None
+
+            elif op == "reserve":
+                key, quantity = args
+                product = products.get(key)
+                if not product:
+                    raise KeyError("Product not found")
+                if product.is_stock_available(quantity):
+                    product.reduce_stock(quantity)
+                    reserved[key] = reserved.get(key, 0) + quantity
+                    result = True
+                else:
+                    result = False
+
+            elif op == "commit":
+                key, quantity = args
+                if quantity <= 0:
+                    raise ValueError("Quantity must be greater than zero")
+                held = reserved.get(key, 0)
+                if held < quantity:
+                    raise ValueError("Commit exceeds reserved quantity")
+                reserved[key] = held - quantity
+                result = True
+
+            elif op == "release":
+                key, quantity = args
+                if quantity <= 0:
+                    raise ValueError("Quantity must be greater than zero")
+                held = reserved.get(key, 0)
+                if held < quantity:
+                    raise ValueError("Release exceeds reserved quantity")
+                reserved[key] = held - quantity
+                if key in products:
+                    products[key].stock += quantity
+                result = True
+
+            elif op == "keys":
+                result = list(products.keys())
+
+            elif op == "export":
+                # Copy out products (and their open reservations) leaving this shard
+                result = []
+                for key in args[0]:
+                    product = products.get(key)
+                    if product:
+                        result.append((key, product.pid, product.name, product.price,
+                                       product.stock, reserved.get(key, 0)))
+
+            elif op == "drop":
+                for key in args[0]:
+                    products.pop(key, None)
+                    reserved.pop(key, None)
+                result = True
+
+            elif op == "import":
+                for key, pid, name, price, stock, held in args[0]:
+                    products[key] = Product(pid, name, price, stock)
+                    if held:
+                        reserved[key] = held
+                result = True
+
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+
+            conn.send((True, result))
+
+        except Exception as e:
+            conn.send((False, e))
+
+    conn.close()
+
+
+class _Shard:
+    """Router-side handle for one worker process"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.conn, child_conn = Pipe()
+        self.process = Process(target=_shard_worker, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.lock = threading.Lock()
+
+    def call(self, op, *args):
+        with self.lock:
+            self.conn.send((op, args))
+            ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def stop(self):
+        try:
+            self.call("stop")
+        except (EOFError, OSError):
+            pass
+        self.conn.close()
+        self.process.join(timeout=5)
+
+
+class _RouterLock:
+    """
+    Many routed calls at once, or one shard migration on its own.
+    A waiting migration holds back new calls so it is not starved.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writing or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+class ShardedInventory:
+    """
+    Inventory partitioned across worker processes.
+    Keys are (store_id, pid) and are placed on shards by consistent hashing,
+    so each shard serves its own part of the catalog on its own core.
+
+    Stock lives in the shards: get_product returns a read-only snapshot,
+    and changing that copy (e.g. Product.reduce_stock) does not reach the
+    shard. Orders must go through reserve, then commit or release.
+    """
+
+    def __init__(self, shard_count: int = 4, replicas: int = 64):
+        self.ring = HashRing(replicas)
+        self.shards = {}
+        self._lock = _RouterLock()
+        for i in range(shard_count):
+            self._start_shard(f"shard-{i}")
+            self.ring.add_node(f"shard-{i}")
+
+    def _start_shard(self, name):
+        self.shards[name] = _Shard(name)
+
+    def _call(self, key, op, *args):
+        with self._lock.read():
+            return self.shards[self.ring.get_node(key)].call(op, key, *args)
+
+    @staticmethod
+    def _key(pid, store_id):
+        return (store_id, pid)
+
+    def add_product(self, product, store_id="default"):
+        key = self._key(product.pid, store_id)
+        self._call(key, "add", product.pid, product.name, product.price, product.stock)
+
+    def get_product(self, pid, store_id="default"):
+        """Return a read-only snapshot copy of the product, or None"""
+        key = self._key(pid, store_id)
+        data = self._call(key, "get")
+        return Product(*data) if data else None
+
+    def set_stock(self, pid, stock, store_id="default") -> bool:
+        key = self._key(pid, store_id)
+        return self._call(key, "set_stock", stock)
+
+    def remove_product(self, pid, store_id="default") -> bool:
+        key = self._key(pid, store_id)
+        return self._call(key, "remove")
+
+    def reserve(self, pid, quantity, store_id="default") -> bool:
+        """Hold stock for an order; False if not enough is available"""
+        key = self._key(pid, store_id)
+        return self._call(key, "reserve", quantity)
+
+    def commit(self, pid, quantity, store_id="default"):
+        """Finalise a reservation once the order is paid"""
+        key = self._key(pid, store_id)
+        return self._call(key, "commit", quantity)
+
+    def release(self, pid, quantity, store_id="default"):
+        """Return reserved stock, e.g. after a failed payment"""
+        key = self._key(pid, store_id)
+        return self._call(key, "release", quantity)
+
+    def add_shard(self, name: str = None) -> int:
+        """
+        Start a new shard and move over only the keys the ring now assigns
+        to it. Returns the number of keys moved.
+
+        Keys are copied to the new shard before it joins the ring and only
+        then dropped from their old shard; routed calls wait meanwhile.
+        """
+        with self._lock.write():
+            if name is None:
+                name = f"shard-{len(self.shards)}"
+            if name in self.shards:
+                raise KeyError("Shard already exists")
+
+            self._start_shard(name)
+            new_shard = self.shards[name]
+            ring = self.ring.copy()
+            ring.add_node(name)
+            leaving = {}
+
+            try:
+                for shard in self.shards.values():
+                    if shard is new_shard:
+                        continue
+                    keys = [key for key in shard.call("keys") if ring.get_node(key) == name]
+                    if keys:
+                        new_shard.call("import", shard.call("export", keys))
+                        leaving[shard] = keys
+            except Exception:
+                del self.shards[name]
+                new_shard.stop()
+                raise
+
+            self.ring = ring
+            for shard, keys in leaving.items():
+                shard.call("drop", keys)
+
+        return sum(len(keys) for keys in leaving.values())
+
+    def load_from_inventory(self, inventory, store_id="default"):
+        """Distribute an existing single-process Inventory across the shards"""
+        with self._lock.read():
+            self._load_batches(inventory, store_id)
+
+    def _load_batches(self, inventory, store_id):
+        batches = {name: [] for name in self.shards}
+        for product in inventory.products.values():
+            key = self._key(product.pid, store_id)
+            batches[self.ring.get_node(key)].append(
+                (key, product.pid, product.name, product.price, product.stock, 0)
+            )
+        for name, records in batches.items():
+            if records:
+                self.shards[name].call("import", records)
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.stop()
+        self.shards.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
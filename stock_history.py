@@ -0,0 +1,167 @@
+import bisect
+import csv
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class StockHistory:
+    """
+    Versioned stock levels for point-in-time queries.
+
+    Every stock change is appended to stock_history.csv (a blank Stock
+    means the product was deleted). Every checkpoint_interval changes the
+    whole catalog is written to stock_checkpoints.csv (or after as many
+    changes as there are SKUs, if the catalog is larger).
+
+    In memory each SKU keeps its own sorted list of versions, so the
+    stock of one SKU at time T is a binary search. A catalog snapshot at
+    time T starts from the last checkpoint before T and replays a bounded
+    number of changes after it.
+    """
+
+    HISTORY_HEADER = ["Timestamp", "Product_ID", "Stock"]
+    CHECKPOINT_HEADER = ["Checkpoint_Time", "Event_Index", "Product_ID", "Stock"]
+
+    def __init__(self, filename: str = "stock_history.csv",
+                 checkpoint_file: str = "stock_checkpoints.csv",
+                 checkpoint_interval: int = 1000):
+        self.filename = filename
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
+
+        self.versions: Dict[int, tuple] = {}   # pid -> ([timestamps], [stock])
+        self.event_times = []
+        self.events = []                        # (pid, stock) aligned with event_times;
+                                                # (None, None) for unreadable rows
+        self.checkpoint_times = []
+        self.checkpoints = []                   # (event index, {pid: stock})
+
+        self._file = None
+        self.load()
+
+    @staticmethod
+    def _parse_stock(value: str) -> Optional[int]:
+        return int(value) if value != "" else None
+
+    def _add_event(self, timestamp: str, pid: int, stock: Optional[int]):
+        times, stocks = self.versions.setdefault(pid, ([], []))
+        times.append(timestamp)
+        stocks.append(stock)
+        self.event_times.append(timestamp)
+        self.events.append((pid, stock))
+
+    def load(self):
+        if os.path.exists(self.filename):
+            with open(self.filename, "r", newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                for row in reader:
+                    if not row:
+                        continue
+                    try:
+                        self._add_event(row[0], int(row[1]), self._parse_stock(row[2]))
+                    except (ValueError, IndexError):
+                        # Keep a placeholder so event indices still match
+                        # the Event_Index stored with each checkpoint
+                        self.event_times.append(self.event_times[-1] if self.event_times else "")
+                        self.events.append((None, None))
+
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, "r", newline="", encoding="utf-8") as file:
+                reader = csv.reader(file)
+                next(reader, None)
+                for row in reader:
+                    try:
+                        timestamp, event_index = row[0], int(row[1])
+                        pid, stock = int(row[2]), self._parse_stock(row[3])
+                    except (ValueError, IndexError):
+                        continue
+
+                    if not self.checkpoints or self.checkpoints[-1][0] != event_index:
+                        self.checkpoint_times.append(timestamp)
+                        self.checkpoints.append((event_index, {}))
+                    if stock is not None:
+                        self.checkpoints[-1][1][pid] = stock
+
+    def _now(self) -> str:
+        # Never go backwards, so the time lists stay sorted
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self.event_times and now < self.event_times[-1]:
+            return self.event_times[-1]
+        return now
+
+    def record(self, pid: int, stock: Optional[int]):
+        """Record a new stock level (None when the product is deleted)"""
+        timestamp = self._now()
+
+        if self._file is None:
+            self._file = open(self.filename, "a", newline="", encoding="utf-8")
+            if self._file.tell() == 0:
+                csv.writer(self._file).writerow(self.HISTORY_HEADER)
+
+        csv.writer(self._file).writerow([timestamp, pid, "" if stock is None else stock])
+        self._file.flush()
+        self._add_event(timestamp, pid, stock)
+
+    def checkpoint_due(self, catalog_size: int = 0) -> bool:
+        # A checkpoint costs one row per SKU, so on large catalogs wait for
+        # at least that many changes; replay stays no longer than a checkpoint
+        last_index = self.checkpoints[-1][0] if self.checkpoints else 0
+        return len(self.events) - last_index >= max(self.checkpoint_interval, catalog_size)
+
+    def checkpoint(self, products: Dict):
+        """Write the stock of the whole catalog as of the latest event"""
+        timestamp = self.event_times[-1] if self.event_times else self._now()
+        event_index = len(self.events)
+        state = {pid: p.stock for pid, p in products.items()}
+
+        with open(self.checkpoint_file, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if file.tell() == 0:
+                writer.writerow(self.CHECKPOINT_HEADER)
+            writer.writerows([timestamp, event_index, pid, stock]
+                             for pid, stock in state.items())
+
+        self.checkpoint_times.append(timestamp)
+        self.checkpoints.append((event_index, state))
+
+    def latest_stock(self, pid: int) -> Optional[int]:
+        versions = self.versions.get(pid)
+        return versions[1][-1] if versions else None
+
+    def stock_at(self, pid: int, when: str) -> Optional[int]:
+        """Stock of one SKU at a 'YYYY-MM-DD HH:MM:SS' time (None if it did not exist)"""
+        versions = self.versions.get(pid)
+        if not versions:
+            return None
+        index = bisect.bisect_right(versions[0], when)
+        return versions[1][index - 1] if index else None
+
+    def snapshot_at(self, when: str) -> Dict[int, int]:
+        """Stock of every SKU at a 'YYYY-MM-DD HH:MM:SS' time"""
+        cp = bisect.bisect_right(self.checkpoint_times, when) - 1
+        if cp >= 0:
+            start, state = self.checkpoints[cp]
+            state = dict(state)
+        else:
+            start, state = 0, {}
+
+        end = bisect.bisect_right(self.event_times, when)
+        for pid, stock in self.events[start:end]:
+            if pid is None:
+                continue
+            if stock is None:
+                state.pop(pid, None)
+            else:
+                state[pid] = stock
+        return state
+
+    def close_of_day(self, date: str) -> Dict[int, int]:
+        """Stock of every SKU at the end of a YYYY-MM-DD day"""
+        return self.snapshot_at(f"{date} 23:59:59")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
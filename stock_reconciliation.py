@@ -0,0 +1,339 @@
+import csv
+import gzip
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from product_file_io import save_inventory_to_file
+from sales_ledger import SalesLedger
+
+JOURNAL_HEADER = [
+    "Date", "Product_ID", "Product_Name", "Recorded_Stock",
+    "Expected_Stock", "Adjustment", "Reason"
+]
+RECONCILIATION = "Reconciliation"
+NOT_APPLIED = "Reconciliation (not applied)"
+
+
+def _append_journal(rows: List[list], filename: str):
+    with open(filename, "a", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if file.tell() == 0:
+            writer.writerow(JOURNAL_HEADER)
+        writer.writerows(rows)
+
+
+def record_stock_adjustments(changes: List[tuple], reason: str,
+                             filename: str = "stock_journal.csv"):
+    """
+    Journal stock set outside of sales (manual updates, supplier feeds)
+    so reconciliation counts it instead of reporting it as a discrepancy.
+    changes holds (product, old stock) pairs, after the new stock is set.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [
+        [now, product.pid, product.name, old_stock, product.stock,
+         product.stock - old_stock, reason]
+        for product, old_stock in changes
+        if product.stock != old_stock
+    ]
+    if rows:
+        _append_journal(rows, filename)
+
+
+def load_stock_adjustments(since: Optional[str], until: Optional[str] = None,
+                           filename: str = "stock_journal.csv") -> tuple:
+    """
+    Net non-sale adjustments per pid, ignoring reconciliation entries.
+    Returns ({pid: adjustment}, {pid: [reasons]}).
+    """
+    adjustments = {}
+    reasons = {}
+    if not os.path.exists(filename):
+        return adjustments, reasons
+
+    with open(filename, "r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if row.get("Reason", "").startswith(RECONCILIATION):
+                continue
+            date = row.get("Date", "")
+            if (since and date < since) or (until and date > until):
+                continue
+            try:
+                pid = int(row["Product_ID"])
+                adjustments[pid] = adjustments.get(pid, 0) + int(row["Adjustment"])
+            except (ValueError, TypeError, KeyError):
+                continue
+            pid_reasons = reasons.setdefault(pid, [])
+            if row.get("Reason", "") not in pid_reasons:
+                pid_reasons.append(row.get("Reason", ""))
+    return adjustments, reasons
+
+
+def take_stock_snapshot(inventory, filename: str = "stock_snapshot.csv"):
+    """Save current stock levels as the starting point for reconciliation"""
+    as_of = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(filename, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["pid", "name", "stock", "as_of"])
+        for p in inventory.products.values():
+            writer.writerow([p.pid, p.name, p.stock, as_of])
+    return as_of
+
+
+def load_stock_snapshot(filename: str = "stock_snapshot.csv") -> tuple:
+    """Return ({pid: stock}, as_of) from a snapshot file"""
+    stock = {}
+    as_of = None
+    with open(filename, "r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            stock[int(row["pid"])] = int(row["stock"])
+            as_of = row["as_of"]
+    return stock, as_of
+
+
+def _split_file(path: str, chunk_bytes: int) -> List[tuple]:
+    """Byte ranges of a plain CSV, skipping the header line"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        file.readline()
+        start = file.tell()
+    ranges = []
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        ranges.append((path, start, end))
+        start = end
+    return ranges
+
+
+def _replay_chunk(path: str, start: int, end: Optional[int],
+                  since: Optional[str], until: Optional[str]) -> Dict[int, int]:
+    """
+    Sum completed sale quantities per pid for the rows whose line starts
+    in [start, end) of the file (the whole file when end is None)
+    """
+    sold = {}
+
+    if path.endswith(".gz"):
+        file = gzip.open(path, "rb")
+    else:
+        file = open(path, "rb")
+
+    with file:
+        header = next(csv.reader([file.readline().decode("utf-8")]), [])
+        try:
+            date_col = header.index("Date")
+            pid_col = header.index("Product_ID")
+            qty_col = header.index("Quantity")
+            status_col = header.index("Payment_Status")
+        except ValueError:
+            return sold
+
+        if end is None:
+            lines = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        else:
+            if start > file.tell():
+                # Land on the first line that starts inside this range
+                file.seek(start - 1)
+                file.readline()
+            # Read the range in one go, finishing the line that crosses its end
+            block = file.read(max(end - file.tell(), 0)) if file.tell() < end else b""
+            if block and not block.endswith(b"\n"):
+                block += file.readline()
+            lines = block.decode("utf-8").splitlines()
+
+        for row in csv.reader(lines):
+            if len(row) != len(header) or row[status_col] != "Completed":
+                continue
+            if since and row[date_col] < since:
+                continue
+            if until and row[date_col] > until:
+                continue
+
+            try:
+                pid = int(row[pid_col])
+                quantity = int(row[qty_col])
+            except ValueError:
+                continue
+            sold[pid] = sold.get(pid, 0) + quantity
+
+    return sold
+
+
+def reconcile_stock(inventory, snapshot_file: str = "stock_snapshot.csv",
+                    filename: str = "daily_sales.csv", ledger_dir: str = "sales_ledger",
+                    until: str = None, workers: int = None,
+                    chunk_bytes: int = 8 * 1024 * 1024,
+                    journal_file: str = "stock_journal.csv") -> Dict:
+    """
+    Replay sales since the snapshot and compare against current stock.
+
+    The ledger is cut into independent chunks (byte ranges of plain CSV
+    files, whole sealed segments) that are summed in parallel worker
+    processes and merged per SKU. Every SKU whose stock differs from
+    snapshot stock minus quantity sold, plus journaled restocks and
+    manual adjustments, is reported.
+    """
+    if not os.path.exists(snapshot_file):
+        return {"error": "No stock snapshot found"}
+
+    try:
+        snapshot, since = load_stock_snapshot(snapshot_file)
+    except (ValueError, KeyError) as e:
+        return {"error": f"Invalid stock snapshot: {e}"}
+
+    tasks = []
+    if os.path.exists(filename):
+        tasks.extend(_split_file(filename, chunk_bytes))
+
+    if os.path.isdir(ledger_dir):
+        ledger = SalesLedger(ledger_dir)
+        for seg in ledger.segments:
+            if since and seg["last_date"] < since:
+                continue
+            if until and seg["first_date"] > until:
+                continue
+            path = ledger.segment_path(seg)
+            if seg["sealed"]:
+                tasks.append((path + ".gz", 0, None))
+            else:
+                tasks.extend(_split_file(path, chunk_bytes))
+
+    sold = {}
+    try:
+        if workers == 1 or len(tasks) <= 1:
+            results = [_replay_chunk(path, start, end, since, until)
+                       for path, start, end in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _replay_chunk,
+                    *zip(*tasks),
+                    [since] * len(tasks),
+                    [until] * len(tasks)
+                ))
+    except Exception as e:
+        return {"error": f"Error reading sales data: {e}"}
+
+    for chunk in results:
+        for pid, quantity in chunk.items():
+            sold[pid] = sold.get(pid, 0) + quantity
+
+    try:
+        adjustments, reasons = load_stock_adjustments(since, until, journal_file)
+    except Exception as e:
+        return {"error": f"Error reading stock journal: {e}"}
+
+    discrepancies = []
+    for pid, start_stock in snapshot.items():
+        product = inventory.get_product(pid)
+        if product is None:
+            continue
+
+        expected = start_stock - sold.get(pid, 0) + adjustments.get(pid, 0)
+        if product.stock != expected:
+            discrepancies.append({
+                "pid": pid,
+                "name": product.name,
+                "snapshot_stock": start_stock,
+                "sold": sold.get(pid, 0),
+                "adjusted": adjustments.get(pid, 0),
+                "expected_stock": expected,
+                "recorded_stock": product.stock,
+                "difference": product.stock - expected
+            })
+
+    # Manual overwrites are counted in expected stock, so list them separately
+    adjusted = []
+    for pid, adjustment in adjustments.items():
+        product = inventory.get_product(pid)
+        if adjustment and pid in snapshot and product is not None:
+            adjusted.append({
+                "pid": pid,
+                "name": product.name,
+                "adjustment": adjustment,
+                "reasons": reasons.get(pid, [])
+            })
+
+    return {
+        "since": since,
+        "chunks": len(tasks),
+        "skus_checked": sum(1 for pid in snapshot if pid in inventory.products),
+        "discrepancies": discrepancies,
+        "adjustments": adjusted
+    }
+
+
+def write_correction_journal(discrepancies: List[Dict], inventory=None,
+                             filename: str = "stock_journal.csv",
+                             products_file: str = "products.csv") -> bool:
+    """
+    Append one entry per discrepancy. If an inventory is given, its stock
+    is set to the expected values and saved once. Discrepancies that
+    cannot be applied (no inventory, missing product, negative expected
+    stock) are journaled as not applied with a zero adjustment.
+    Returns False if saving the corrected inventory failed.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
+    applied = 0
+
+    for d in discrepancies:
+        product = inventory.get_product(d["pid"]) if inventory is not None else None
+        if product is not None and d["expected_stock"] >= 0:
+            product.stock = d["expected_stock"]
+            applied += 1
+            adjustment, reason = -d["difference"], RECONCILIATION
+        else:
+            adjustment, reason = 0, NOT_APPLIED
+
+        rows.append([
+            now, d["pid"], d["name"], d["recorded_stock"],
+            d["expected_stock"], adjustment, reason
+        ])
+
+    saved = True
+    if applied:
+        saved = save_inventory_to_file(inventory, products_file)
+    if rows:
+        _append_journal(rows, filename)
+    return saved
+
+
+def display_reconciliation(report: Dict):
+    if "error" in report:
+        print(f"❌ {report['error']}")
+        return
+
+    print("\n" + "=" * 60)
+    print("              STOCK RECONCILIATION")
+    print("=" * 60)
+    print(f"Snapshot taken: {report['since']}")
+    print("Expected = snapshot - sold + journaled restocks/updates")
+    print(f"SKUs checked: {report['skus_checked']}")
+    print("-" * 60)
+
+    if not report["discrepancies"]:
+        print("✅ No discrepancies found")
+    else:
+        print(f"{'ID':<6} {'Product':<20} {'Expected':<10} {'Recorded':<10} {'Diff':<6}")
+        print("-" * 60)
+        for d in report["discrepancies"]:
+            print(
+                f"{d['pid']:<6} {d['name']:<20} "
+                f"{d['expected_stock']:<10} {d['recorded_stock']:<10} "
+                f"{d['difference']:+d}"
+            )
+
+    if report.get("adjustments"):
+        print("-" * 60)
+        print("STOCK CHANGED OUTSIDE OF SALES (counted in expected):")
+        for a in report["adjustments"]:
+            print(
+                f"  {a['pid']:<6} {a['name']:<20} {a['adjustment']:+d}  "
+                f"({', '.join(a['reasons'])})"
+            )
+
+    print("=" * 60)
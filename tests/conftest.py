@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Let plain `pytest` import the top-level modules, like `python -m pytest`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
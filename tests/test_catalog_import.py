@@ -0,0 +1,106 @@
+import catalog_import
+from catalog_import import apply_catalog_feed
+from product import Inventory, Product
+from product_file_io import load_inventory_from_file
+
+
+def make_inventory():
+    inventory = Inventory()
+    inventory.add_product(Product(1, "Rice", 60.0, 50))
+    inventory.add_product(Product(2, "Sugar", 45.0, 30))
+    inventory.add_product(Product(3, "Oil", 150.0, 20))
+    return inventory
+
+
+def write_feed(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def state(inventory):
+    return {pid: (p.name, p.price, p.stock) for pid, p in inventory.products.items()}
+
+
+def apply(tmp_path, inventory, lines, **kwargs):
+    feed = write_feed(tmp_path / "feed.csv", lines)
+    return apply_catalog_feed(inventory, feed, save_to=str(tmp_path / "products.csv"),
+                              journal_file=str(tmp_path / "journal.csv"), **kwargs)
+
+
+def test_counts_and_single_save(tmp_path):
+    inventory = make_inventory()
+    report = apply(tmp_path, inventory, [
+        "pid,name,price,stock,action",
+        "1,Rice,60,50,",
+        "2,Sugar,50,40,",
+        "3,,,,delete",
+        "4,Tea,220,15,",
+    ])
+
+    assert (report["added"], report["updated"], report["deleted"], report["unchanged"]) == (1, 1, 1, 1)
+    assert report["rejected"] == []
+    assert "error" not in report
+    assert state(load_inventory_from_file(str(tmp_path / "products.csv"))) == state(inventory)
+    assert state(inventory) == {
+        1: ("Rice", 60.0, 50), 2: ("Sugar", 50.0, 40), 4: ("Tea", 220.0, 15)
+    }
+
+
+def test_rejected_rows_report_line_numbers(tmp_path):
+    inventory = make_inventory()
+    report = apply(tmp_path, inventory, [
+        "pid,name,price,stock,action",
+        "5,Salt,-1,10,",
+        "6,Soap,35,abc,",
+        "7,,10,10,",
+        "8,Tea,220,15,",
+        "8,Tea again,220,15,",
+        "99,,,,delete",
+    ])
+
+    assert [line for line, _ in report["rejected"]] == [2, 3, 4, 6, 7]
+    assert report["rejected"][2][1] == "Name is required"
+    assert report["rejected"][3][1] == "Duplicate product ID in feed"
+    assert report["rejected"][4][1] == "Product not found for delete"
+    assert report["added"] == 1
+
+
+def test_delete_missing_removes_products_not_in_feed(tmp_path):
+    inventory = make_inventory()
+    report = apply(tmp_path, inventory, [
+        "pid,name,price,stock",
+        "1,Rice,60,50",
+    ], delete_missing=True)
+
+    assert report["deleted"] == 2
+    assert list(inventory.products) == [1]
+
+
+def test_missing_columns_is_an_error(tmp_path):
+    inventory = make_inventory()
+    report = apply(tmp_path, inventory, ["pid,name,price", "1,Rice,60"])
+
+    assert report["error"] == "Feed is missing columns: stock"
+    assert state(inventory) == state(make_inventory())
+
+
+def test_failed_save_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_import, "save_inventory_to_file", lambda *args: False)
+    inventory = make_inventory()
+    report = apply(tmp_path, inventory, ["pid,name,price,stock", "4,Tea,220,15"])
+
+    assert "could not be saved" in report["error"]
+    assert report["added"] == 1
+
+
+def test_unreadable_feed_leaves_inventory_untouched(tmp_path):
+    inventory = make_inventory()
+    feed = tmp_path / "feed.csv"
+    feed.write_bytes(b"pid,name,price,stock\n2,Sugar,99,99\n4,Tea\xff\xfe,220,15\n")
+
+    report = apply_catalog_feed(inventory, str(feed), save_to=str(tmp_path / "products.csv"),
+                                journal_file=str(tmp_path / "journal.csv"))
+
+    assert report["error"].startswith("Error reading feed")
+    assert state(inventory) == state(make_inventory())
+    assert not (tmp_path / "products.csv").exists()
@@ -0,0 +1,64 @@
+import pytest
+
+from billing import Bill
+from customer_index import WALK_IN_CUSTOMER, CustomerIndex
+from product import Product
+from sales_ledger import SalesLedger
+
+
+@pytest.fixture
+def index(tmp_path):
+    return CustomerIndex(str(tmp_path / "customer_index.csv"))
+
+
+def record(index, customer, bill_number, date, total):
+    index.record_bill(customer, bill_number, date, total, "daily_sales.csv", 0)
+
+
+def test_saved_bill_is_recorded_and_readable(tmp_path, index):
+    bill = Bill("Alice")
+    bill.add_item(Product(1, "Rice", 60.0, 10), 2)
+    bill.set_payment_info("Cash")
+
+    assert bill.save_to_ledger(SalesLedger(str(tmp_path / "ledger")), index)
+
+    entry, = index.last_bills("Alice")
+    assert entry["bill_number"] == bill.bill_number
+    assert index.lifetime_spend("Alice") == pytest.approx(bill.calculate_total())
+    rows = CustomerIndex.read_bill_rows(entry)
+    assert [(row["Product_ID"], row["Quantity"]) for row in rows] == [("1", "2")]
+
+    reloaded = CustomerIndex(index.filename)
+    assert reloaded.last_bills("Alice")[0]["offset"] == entry["offset"]
+
+
+def test_last_bills_are_newest_first(index):
+    for i in range(7):
+        record(index, "Alice", f"B{i}", f"2026-10-0{i + 1} 10:00:00", 10)
+
+    assert [b["bill_number"] for b in index.last_bills("Alice", 3)] == ["B6", "B5", "B4"]
+    assert index.last_bills("Nobody") == []
+
+
+def test_top_spenders_leave_out_walk_in_customers(index):
+    record(index, WALK_IN_CUSTOMER, "B1", "2026-10-01 10:00:00", 1000)
+    record(index, "Alice", "B2", "2026-10-01 10:00:00", 50)
+    record(index, "Bob", "B3", "2026-10-01 10:00:00", 80)
+    record(index, "Alice", "B4", "2026-10-02 10:00:00", 40)
+
+    assert index.top_spenders(5) == [("Alice", 90), ("Bob", 80)]
+
+
+def test_repeat_customer_rate_with_and_without_month_range(index):
+    record(index, "Alice", "B1", "2026-08-05 10:00:00", 10)
+    record(index, "Alice", "B2", "2026-09-05 10:00:00", 10)
+    record(index, "Bob", "B3", "2026-09-07 10:00:00", 10)
+    record(index, "Bob", "B4", "2026-10-07 10:00:00", 10)
+    record(index, "Carol", "B5", "2026-10-09 10:00:00", 10)
+    record(index, WALK_IN_CUSTOMER, "B6", "2026-08-01 10:00:00", 10)
+    record(index, WALK_IN_CUSTOMER, "B7", "2026-10-01 10:00:00", 10)
+
+    assert index.repeat_customer_rate() == pytest.approx(2 / 3)
+    assert index.repeat_customer_rate("2026-09", "2026-10") == pytest.approx(1 / 3)
+    assert index.repeat_customer_rate("2026-10") == 0.0
+    assert index.repeat_customer_rate("2027-01") == 0.0
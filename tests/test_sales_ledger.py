@@ -0,0 +1,95 @@
+import csv
+import os
+
+from customer_index import CustomerIndex
+from sales_ledger import SALES_HEADER, SalesLedger, iter_sales_rows
+
+
+def sale(date, bill="B1", customer="Alice", pid=101, quantity=1, total=10.5):
+    return [date, bill, customer, pid, "Rice", quantity, 10, 10,
+            0.0, 5.0, total, "Cash", "Completed"]
+
+
+def test_segments_roll_daily_and_seal_compressed(tmp_path):
+    ledger = SalesLedger(str(tmp_path / "ledger"))
+    ledger.append_rows([sale("2026-10-01 10:00:00", "B1")])
+    ledger.append_rows([sale("2026-10-01 11:00:00", "B2")])
+    ledger.append_rows([sale("2026-10-02 09:00:00", "B3")])
+
+    first, second = ledger.segments
+    assert first["sealed"] and first["rows"] == 2
+    assert not second["sealed"]
+    assert os.path.exists(ledger.segment_path(first) + ".gz")
+    assert not os.path.exists(ledger.segment_path(first))
+
+    reloaded = SalesLedger(str(tmp_path / "ledger"))
+    assert [row["Bill_Number"] for row in reloaded.iter_rows()] == ["B1", "B2", "B3"]
+
+
+def test_segments_roll_by_size(tmp_path):
+    ledger = SalesLedger(str(tmp_path / "ledger"), max_segment_bytes=300)
+    for i in range(10):
+        ledger.append_rows([sale("2026-10-01 10:00:00", f"B{i}")])
+
+    assert len(ledger.segments) > 1
+    assert sum(seg["rows"] for seg in ledger.segments) == 10
+    assert len({seg["segment"] for seg in ledger.segments}) == len(ledger.segments)
+
+
+def test_iter_rows_skips_segments_outside_range(tmp_path):
+    ledger = SalesLedger(str(tmp_path / "ledger"))
+    ledger.append_rows([sale("2026-10-01 10:00:00", "B1")])
+    ledger.append_rows([sale("2026-10-02 10:00:00", "B2")])
+    os.remove(ledger.segment_path(ledger.segments[0]) + ".gz")
+
+    rows = list(ledger.iter_rows("2026-10-02", "2026-10-02"))
+
+    assert [row["Bill_Number"] for row in rows] == ["B2"]
+
+
+def test_migrate_legacy_file_into_sealed_segments(tmp_path):
+    legacy = tmp_path / "daily_sales.csv"
+    with open(legacy, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(SALES_HEADER)
+        writer.writerow(sale("2026-09-01 10:00:00", "OLD1"))
+        writer.writerow(["broken", "row"])
+        writer.writerow(sale("2026-09-02 10:00:00", "OLD2"))
+
+    ledger = SalesLedger(str(tmp_path / "ledger"))
+    ledger.append_rows([sale("2026-10-01 10:00:00", "NEW1")])
+
+    assert ledger.migrate_legacy(str(legacy)) == (2, 1)
+    assert not legacy.exists()
+    assert all(seg["sealed"] for seg in ledger.segments[:2])
+
+    rows = iter_sales_rows(str(legacy), str(tmp_path / "ledger"))
+    assert [row["Bill_Number"] for row in rows] == ["OLD1", "OLD2", "NEW1"]
+
+
+def test_customer_index_rebuild_reads_segments(tmp_path):
+    ledger_dir = str(tmp_path / "ledger")
+    ledger = SalesLedger(ledger_dir)
+    ledger.append_rows([sale("2026-10-01 10:00:00", "B1", "Alice")])
+    ledger.append_rows([sale("2026-10-02 10:00:00", "B2", "Alice", total=20.0)])
+
+    index = CustomerIndex(str(tmp_path / "customer_index.csv"))
+    assert index.rebuild(str(tmp_path / "missing.csv"), ledger_dir) == 2
+    assert index.lifetime_spend("Alice") == 30.5
+
+    oldest = index.last_bills("Alice", 2)[-1]
+    rows = CustomerIndex.read_bill_rows(oldest)
+    assert [row["Bill_Number"] for row in rows] == ["B1"]
+
+
+def test_customer_index_is_stale_until_rebuilt(tmp_path):
+    ledger_dir = str(tmp_path / "ledger")
+    legacy = str(tmp_path / "missing.csv")
+    index = CustomerIndex(str(tmp_path / "customer_index.csv"))
+    assert not index.is_stale(legacy, ledger_dir)
+
+    SalesLedger(ledger_dir).append_rows([sale("2026-10-01 10:00:00")])
+    assert index.is_stale(legacy, ledger_dir)
+
+    index.rebuild(legacy, ledger_dir)
+    assert not index.is_stale(legacy, ledger_dir)
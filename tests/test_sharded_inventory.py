@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from product import Product
+from sharded_inventory import HashRing, ShardedInventory
+
+
+@pytest.fixture
+def inventory():
+    sharded = ShardedInventory(shard_count=3)
+    yield sharded
+    sharded.close()
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing()
+    for name in ("a", "b", "c"):
+        ring.add_node(name)
+    before = {key: ring.get_node(key) for key in range(2000)}
+
+    ring.add_node("d")
+    moved = [key for key in before if ring.get_node(key) != before[key]]
+
+    assert moved
+    assert all(ring.get_node(key) == "d" for key in moved)
+
+
+def test_add_shard_keeps_every_product_and_reservation(inventory):
+    for pid in range(200):
+        inventory.add_product(Product(pid, f"P{pid}", 10, 5))
+    assert inventory.reserve(7, 3)
+
+    moved = inventory.add_shard()
+
+    assert moved > 0
+    assert len(inventory.shards) == 4
+    for pid in range(200):
+        assert inventory.get_product(pid) is not None
+    assert inventory.get_product(7).stock == 2
+    inventory.release(7, 3)
+    assert inventory.get_product(7).stock == 5
+
+    total_keys = sum(len(shard.call("keys")) for shard in inventory.shards.values())
+    assert total_keys == 200
+
+
+def test_commit_and_release_reject_bad_quantities(inventory):
+    inventory.add_product(Product(7, "Soap", 35, 10))
+    assert inventory.reserve(7, 3)
+
+    with pytest.raises(ValueError):
+        inventory.release(7, -20)
+    with pytest.raises(ValueError):
+        inventory.commit(7, 0)
+    with pytest.raises(ValueError):
+        inventory.commit(8, 1)
+
+    inventory.commit(7, 3)
+    assert inventory.get_product(7).stock == 7
+    with pytest.raises(ValueError):
+        inventory.release(7, 1)
+
+
+def test_concurrent_add_shard_with_same_name_adds_it_once(inventory):
+    for pid in range(300):
+        inventory.add_product(Product(pid, f"P{pid}", 10, 5))
+    errors = []
+
+    def add():
+        try:
+            inventory.add_shard("x")
+        except KeyError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=add) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 1
+    assert len(inventory.shards) == 4
+    assert len(inventory.ring._points) == 4 * inventory.ring.replicas
+    assert all(inventory.get_product(pid) is not None for pid in range(300))
+
+
+def test_waiting_migration_is_not_starved_by_routed_calls(inventory):
+    inventory.add_product(Product(1, "Rice", 60, 50))
+    stop = threading.Event()
+
+    def keep_reading():
+        while not stop.is_set():
+            inventory.get_product(1)
+
+    readers = [threading.Thread(target=keep_reading) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        done = threading.Thread(target=inventory.add_shard)
+        done.start()
+        done.join(timeout=10)
+        assert not done.is_alive()
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
@@ -0,0 +1,81 @@
+from product import Inventory, Product
+from stock_history import StockHistory
+
+
+def make_history(tmp_path, interval=3):
+    return StockHistory(str(tmp_path / "history.csv"),
+                        str(tmp_path / "checkpoints.csv"), interval)
+
+
+def write_history(tmp_path, rows):
+    with open(tmp_path / "history.csv", "w", encoding="utf-8") as file:
+        file.write("Timestamp,Product_ID,Stock\n")
+        file.writelines(f"{row}\n" for row in rows)
+
+
+def test_stock_at_and_snapshot_follow_inventory_changes(tmp_path):
+    history = make_history(tmp_path)
+    inventory = Inventory()
+    inventory.attach_history(history)
+
+    history._now = lambda: "2026-10-01 09:00:00"
+    inventory.add_product(Product(1, "Rice", 60, 50))
+    inventory.add_product(Product(2, "Sugar", 45, 30))
+    history._now = lambda: "2026-10-02 09:00:00"
+    inventory.get_product(1).reduce_stock(5)
+    inventory.get_product(2).stock = 40
+    history._now = lambda: "2026-10-03 09:00:00"
+    inventory.remove_product(2)
+    inventory.get_product(1).stock = 10
+    history.close()
+
+    assert history.checkpoints
+    assert history.stock_at(1, "2026-10-01 23:59:59") == 50
+    assert history.stock_at(1, "2026-10-02 23:59:59") == 45
+    assert history.stock_at(1, "2026-09-30 00:00:00") is None
+    assert history.close_of_day("2026-10-01") == {1: 50, 2: 30}
+    assert history.close_of_day("2026-10-02") == {1: 45, 2: 40}
+    assert history.close_of_day("2026-10-03") == {1: 10}
+
+    reloaded = make_history(tmp_path)
+    for day in ("2026-10-01", "2026-10-02", "2026-10-03"):
+        assert reloaded.close_of_day(day) == history.close_of_day(day)
+
+
+def test_unreadable_history_rows_keep_checkpoint_offsets(tmp_path):
+    write_history(tmp_path, [
+        "2026-10-01 09:00:00,1,50",
+        "garbage",
+        "2026-10-01 10:00:00,1,40",
+        "2026-10-02 09:00:00,1,30",
+    ])
+    with open(tmp_path / "checkpoints.csv", "w", encoding="utf-8") as file:
+        file.write("Checkpoint_Time,Event_Index,Product_ID,Stock\n")
+        file.write("2026-10-01 10:00:00,3,1,40\n")
+
+    history = make_history(tmp_path)
+
+    assert history.close_of_day("2026-10-01") == {1: 40}
+    assert history.close_of_day("2026-10-02") == {1: 30}
+    assert history.stock_at(1, "2026-10-01 09:30:00") == 50
+
+
+def test_attach_records_products_deleted_while_closed(tmp_path):
+    history = make_history(tmp_path)
+    inventory = Inventory()
+    inventory.attach_history(history)
+    history._now = lambda: "2026-10-01 09:00:00"
+    inventory.add_product(Product(1, "Rice", 60, 5))
+    inventory.add_product(Product(2, "Sugar", 45, 5))
+    history.close()
+
+    reopened = make_history(tmp_path)
+    reopened._now = lambda: "2026-10-02 09:00:00"
+    inventory = Inventory()
+    inventory.add_product(Product(1, "Rice", 60, 5))
+    inventory.attach_history(reopened)
+
+    assert reopened.stock_at(2, "2026-10-02 12:00:00") is None
+    assert reopened.stock_at(2, "2026-10-01 12:00:00") == 5
+    assert reopened.snapshot_at("2026-10-02 12:00:00") == {1: 5}
+    reopened.close()
@@ -0,0 +1,117 @@
+import csv
+
+from product import Inventory, Product
+from sales_ledger import SALES_HEADER
+from stock_reconciliation import (
+    NOT_APPLIED, _replay_chunk, _split_file, display_reconciliation, reconcile_stock,
+    record_stock_adjustments, write_correction_journal
+)
+
+
+def write_sales(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(SALES_HEADER)
+        for i, (pid, quantity, status) in enumerate(rows):
+            writer.writerow(["2026-10-01 10:00:00", f"B{i}", "Alice, \"Al\"", pid,
+                             "Item", quantity, 1, 1, 0, 5, 1, "Cash", status])
+
+
+def write_snapshot(path, stock):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["pid", "name", "stock", "as_of"])
+        for pid, value in stock.items():
+            writer.writerow([pid, f"P{pid}", value, "2026-01-01 00:00:00"])
+
+
+def make_inventory(stock):
+    inventory = Inventory()
+    for pid, value in stock.items():
+        inventory.add_product(Product(pid, f"P{pid}", 1, value))
+    return inventory
+
+
+def test_chunks_count_every_row_exactly_once(tmp_path):
+    path = str(tmp_path / "sales.csv")
+    rows = [(100 + i % 3, i % 4 + 1, "Failed" if i % 5 == 0 else "Completed")
+            for i in range(500)]
+    write_sales(path, rows)
+
+    expected = {}
+    for pid, quantity, status in rows:
+        if status == "Completed":
+            expected[pid] = expected.get(pid, 0) + quantity
+
+    for chunk_bytes in (1, 37, 128, 10 ** 6):
+        totals = {}
+        for chunk in _split_file(path, chunk_bytes):
+            for pid, quantity in _replay_chunk(*chunk, None, None).items():
+                totals[pid] = totals.get(pid, 0) + quantity
+        assert totals == expected
+
+
+def test_journaled_restock_is_not_a_discrepancy(tmp_path):
+    snapshot = str(tmp_path / "snapshot.csv")
+    journal = str(tmp_path / "journal.csv")
+    sales = str(tmp_path / "sales.csv")
+    write_snapshot(snapshot, {1: 10, 2: 10})
+    write_sales(sales, [(1, 3, "Completed")])
+
+    inventory = make_inventory({1: 7, 2: 10})
+    product = inventory.get_product(1)
+    product.stock = 50
+    record_stock_adjustments([(product, 7)], "Catalog import", journal)
+    inventory.get_product(2).stock = 9
+
+    report = reconcile_stock(inventory, snapshot, sales, str(tmp_path / "ledger"),
+                             journal_file=journal, workers=1)
+
+    assert [d["pid"] for d in report["discrepancies"]] == [2]
+    assert report["adjustments"] == [
+        {"pid": 1, "name": "P1", "adjustment": 43, "reasons": ["Catalog import"]}
+    ]
+
+
+def test_manual_update_stays_visible_in_report(tmp_path, capsys):
+    snapshot = str(tmp_path / "snapshot.csv")
+    journal = str(tmp_path / "journal.csv")
+    write_snapshot(snapshot, {1: 10})
+
+    inventory = make_inventory({1: 10})
+    product = inventory.get_product(1)
+    product.stock = 4
+    record_stock_adjustments([(product, 10)], "Manual update", journal)
+
+    report = reconcile_stock(inventory, snapshot, str(tmp_path / "sales.csv"),
+                             str(tmp_path / "ledger"), journal_file=journal, workers=1)
+    display_reconciliation(report)
+
+    assert report["discrepancies"] == []
+    assert report["adjustments"][0]["adjustment"] == -6
+    assert "Manual update" in capsys.readouterr().out
+
+
+def test_negative_expected_stock_is_journaled_as_not_applied(tmp_path):
+    snapshot = str(tmp_path / "snapshot.csv")
+    journal = str(tmp_path / "journal.csv")
+    sales = str(tmp_path / "sales.csv")
+    write_snapshot(snapshot, {1: 2, 2: 10})
+    write_sales(sales, [(1, 5, "Completed"), (2, 1, "Completed")])
+
+    inventory = make_inventory({1: 0, 2: 7})
+    report = reconcile_stock(inventory, snapshot, sales, str(tmp_path / "ledger"),
+                             journal_file=journal, workers=1)
+    assert write_correction_journal(report["discrepancies"], inventory, journal,
+                                    str(tmp_path / "products.csv"))
+
+    assert inventory.get_product(1).stock == 0
+    assert inventory.get_product(2).stock == 9
+    with open(journal, newline="", encoding="utf-8") as file:
+        entries = {int(row["Product_ID"]): row for row in csv.DictReader(file)}
+    assert entries[1]["Reason"] == NOT_APPLIED and entries[1]["Adjustment"] == "0"
+    assert entries[2]["Adjustment"] == "2"
+
+    report = reconcile_stock(inventory, snapshot, sales, str(tmp_path / "ledger"),
+                             journal_file=journal, workers=1)
+    assert [d["pid"] for d in report["discrepancies"]] == [1]